@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+GitHub MCP Agent Tools
+Plain Python implementations and MCP schemas of the agent's tools, shared by
+agent_demo.py (as LangChain tools) and the MCP servers.
+"""
+
+from typing import Any, Dict, List
+
+_HELP_TEXT = """
+🤖 I'm an autonomous agent with the following capabilities:
+
+📊 Mathematical Operations:
+- Add two numbers: "add 5 and 3"
+- Multiply two numbers: "multiply 4 by 6"
+
+🔮 Future Capabilities (coming soon):
+- GitHub repository management
+- Issue tracking and creation
+- Pull request operations
+
+Just ask me to perform any of these operations!
+""".strip()
+
+def add_numbers(a: int, b: int) -> int:
+    """Add two numbers together."""
+    return a + b
+
+def multiply_numbers(x: int, y: int) -> int:
+    """Multiply two numbers together."""
+    return x * y
+
+def get_help() -> str:
+    """Get information about available capabilities."""
+    return _HELP_TEXT
+
+# MCP tool definitions (keyword arguments for mcp.types.Tool)
+TOOL_SCHEMAS: List[Dict[str, Any]] = [
+    {
+        "name": "add_numbers",
+        "description": "Add two numbers together",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "integer",
+                    "description": "First number to add"
+                },
+                "b": {
+                    "type": "integer",
+                    "description": "Second number to add"
+                }
+            },
+            "required": ["a", "b"]
+        }
+    },
+    {
+        "name": "multiply_numbers",
+        "description": "Multiply two numbers together",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "x": {
+                    "type": "integer",
+                    "description": "First number to multiply"
+                },
+                "y": {
+                    "type": "integer",
+                    "description": "Second number to multiply"
+                }
+            },
+            "required": ["x", "y"]
+        }
+    },
+    {
+        "name": "get_agent_help",
+        "description": "Get information about the agent's capabilities",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_system_info",
+        "description": "Get information about the MCP server and agent system",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    }
+]
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the GitHub MCP Agent servers
+Used by both mcp_server.py and mcp_server_standalone.py.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import mcp.types as types
+from pydantic import AnyUrl
+
+import agent_tools
+from agent_tools import TOOL_SCHEMAS
+
+try:
+    import orjson
+except ImportError:  # standalone server may run without the project venv
+    orjson = None
+
+# Static text served for the agent://capabilities resource
+CAPABILITIES_TEXT = """
+GitHub MCP Agent Capabilities:
+
+🔧 Mathematical Operations:
+- Addition of two integers
+- Multiplication of two integers
+
+🤖 System Operations:
+- Configuration information
+- Help and documentation
+- Status monitoring
+
+🔮 Future Capabilities:
+- GitHub repository management
+- Issue tracking and creation
+- Pull request operations
+- Code analysis and review
+
+🌐 MCP Integration:
+- Full Model Context Protocol support
+- Claude Desktop integration
+- Tool execution and resource access
+- Real-time agent communication
+""".strip()
+
+# Output format for structured responses ("json" or "toon"). Read once so the
+# MIME type advertised in RESOURCE_LIST always matches serialize(); load .env
+# before importing this module.
+MCP_SERIALIZER = os.getenv("MCP_SERIALIZER", "json").lower()
+
+# A tool handler and the argument names it requires
+ToolSpec = Tuple[Callable[..., str], Tuple[str, ...]]
+
+# Server-specific get_system_info entries: (TOON key, text label, value)
+InfoField = Tuple[str, str, Any]
+
+TOOL_NAMES: List[str] = [schema["name"] for schema in TOOL_SCHEMAS]
+
+# Static parts of the get_system_info text around the per-call fields
+_SYSINFO_HEADER = "🏗️ GitHub MCP Agent System Information:"
+_SYSINFO_FOOTER = """
+🔧 Available Tools:
+- Mathematical operations (add, multiply)
+- System information and help
+- Future: GitHub repository management
+
+🌐 MCP Integration:
+- Server Status: Active
+- Protocol: Model Context Protocol
+- Client: Claude Desktop
+""".strip()
+
+# Strings that would be misread as another TOON type or break the syntax
+_TOON_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?$")
+_TOON_SPECIAL_CHARS = set(',:"\\[]{}\n\r\t')
+_TOON_KEY_RE = re.compile(r"^[A-Za-z_][\w.]*$")
+
+def get_logger(name: str = "github-mcp-agent") -> logging.Logger:
+    """Return the server logger, batching records before they reach stderr"""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        # A request's records are written together (servers call flush_logger
+        # once per request); warnings and errors flush immediately
+        logger.addHandler(logging.handlers.MemoryHandler(
+            capacity=64, flushLevel=logging.WARNING, target=stream_handler
+        ))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+def flush_logger(logger: logging.Logger):
+    """Write out any buffered log records"""
+    for handler in logger.handlers:
+        handler.flush()
+
+def call_tool(tools: Dict[str, ToolSpec], name: str, arguments: Optional[Dict[str, Any]]) -> str:
+    """Validate arguments and run a tool from a dispatch table"""
+    spec = tools.get(name)
+    if spec is None:
+        return f"❌ Error: Unknown tool '{name}'"
+
+    fn, required = spec
+    arguments = arguments or {}
+    missing = [key for key in required if arguments.get(key) is None]
+    if missing:
+        params = " and ".join(f"'{key}'" for key in required)
+        return f"❌ Error: Parameters {params} are required for '{name}'"
+
+    return fn(**{key: arguments[key] for key in required})
+
+def do_add(a: int, b: int) -> str:
+    result = agent_tools.add_numbers(a, b)
+    get_logger().info(f"🔢 Adding {a} + {b} = {result}")
+    return f"🔢 Addition Result: {a} + {b} = {result}"
+
+def do_multiply(x: int, y: int) -> str:
+    result = agent_tools.multiply_numbers(x, y)
+    get_logger().info(f"✖️ Multiplying {x} × {y} = {result}")
+    return f"✖️ Multiplication Result: {x} × {y} = {result}"
+
+def do_help() -> str:
+    return f"🤖 Agent Capabilities:\n{agent_tools.get_help()}"
+
+def build_tools(system_info: Callable[[], str]) -> Dict[str, ToolSpec]:
+    """Tool dispatch table: name -> (handler, required argument names)"""
+    return {
+        "add_numbers": (do_add, ("a", "b")),
+        "multiply_numbers": (do_multiply, ("x", "y")),
+        "get_agent_help": (do_help, ()),
+        "get_system_info": (system_info, ()),
+    }
+
+def system_info(config: Any, fields: Sequence[InfoField] = ()) -> str:
+    """Render get_system_info for an LLM config plus server-specific fields"""
+    if use_toon():
+        return _SYSINFO_HEADER + "\n" + to_toon({
+            "configuration": {
+                "llm_provider": config.provider,
+                "ollama_model": config.ollama_model,
+                "gemini_model": config.gemini_model,
+                **{key: value for key, _, value in fields}
+            },
+            "available_tools": TOOL_NAMES,
+            "mcp_integration": {
+                "server_status": "active",
+                "protocol": "Model Context Protocol",
+                "client": "Claude Desktop"
+            }
+        })
+
+    return "\n".join([
+        _SYSINFO_HEADER,
+        "",
+        "📋 Configuration:",
+        f"- LLM Provider: {config.provider}",
+        f"- Ollama Model: {config.ollama_model}",
+        f"- Gemini Model: {config.gemini_model}",
+        *(f"- {label}: {value}" for _, label, value in fields),
+        "",
+        _SYSINFO_FOOTER
+    ])
+
+def read_resource(uri: AnyUrl, config: Any,
+                  extra: Optional[Callable[[], Dict[str, Any]]] = None) -> str:
+    """Serve the agent:// resources for an LLM config plus server-specific fields"""
+    if str(uri) == "agent://config":
+        # extra is only called here; it may be costly (e.g. initialising the LLM)
+        return serialize({
+            "provider": config.provider,
+            "ollama_model": config.ollama_model,
+            "gemini_model": config.gemini_model,
+            **(extra() if extra else {}),
+            "tools_available": TOOL_NAMES
+        })
+
+    elif str(uri) == "agent://capabilities":
+        return CAPABILITIES_TEXT
+
+    else:
+        raise ValueError(f"Unknown resource: {uri}")
+
+def use_toon() -> bool:
+    """Whether structured responses should be emitted as TOON instead of JSON"""
+    return MCP_SERIALIZER == "toon"
+
+def serialize(obj: Any) -> str:
+    """Serialize structured data with the configured MCP serializer"""
+    if use_toon():
+        return to_toon(obj)
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def serialized_mime_type() -> str:
+    """MIME type matching the output of serialize()"""
+    return "text/toon" if use_toon() else "application/json"
+
+def _toon_scalar(value: Any) -> str:
+    """Encode a primitive value, quoting strings only when needed"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+
+    text = str(value)
+    if (not text or text != text.strip() or text in ("true", "false", "null")
+            or text.startswith("-") or _TOON_NUMBER_RE.match(text)
+            or any(char in _TOON_SPECIAL_CHARS for char in text)):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+def _toon_key(key: Any) -> str:
+    """Encode an object key, quoting anything that isn't identifier-like"""
+    key = str(key)
+    return key if _TOON_KEY_RE.match(key) else json.dumps(key, ensure_ascii=False)
+
+def _is_primitive(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+def _toon_field(key: str, value: Any, depth: int) -> Iterator[str]:
+    """Yield the TOON lines for a single key/value pair"""
+    pad = "  " * depth
+
+    if isinstance(value, dict):
+        yield f"{pad}{key}:"
+        for child_key, child in value.items():
+            yield from _toon_field(_toon_key(child_key), child, depth + 1)
+
+    elif isinstance(value, (list, tuple)):
+        if all(_is_primitive(item) for item in value):
+            row = ",".join(_toon_scalar(item) for item in value)
+            yield f"{pad}{key}[{len(value)}]: {row}".rstrip()
+        elif (all(isinstance(item, dict) for item in value)
+              and all(item.keys() == value[0].keys() for item in value)
+              and all(_is_primitive(v) for item in value for v in item.values())):
+            # Uniform objects collapse into a table: header once, one row each
+            fields = list(value[0])
+            header = ",".join(_toon_key(field) for field in fields)
+            yield f"{pad}{key}[{len(value)}]{{{header}}}:"
+            for item in value:
+                yield f"{pad}  " + ",".join(_toon_scalar(item[field]) for field in fields)
+        else:
+            yield f"{pad}{key}[{len(value)}]:"
+            for item in value:
+                if isinstance(item, dict) and item:
+                    lines = [line for child_key, child in item.items()
+                             for line in _toon_field(_toon_key(child_key), child, depth + 2)]
+                    yield f"{pad}  - {lines[0].lstrip()}"
+                    yield from lines[1:]
+                elif _is_primitive(item):
+                    yield f"{pad}  - {_toon_scalar(item)}"
+                else:
+                    yield f"{pad}  - {json.dumps(item, ensure_ascii=False)}"
+
+    else:
+        yield f"{pad}{key}: {_toon_scalar(value)}"
+
+def to_toon(obj: Any) -> str:
+    """Encode a JSON-compatible object as TOON (Token-Oriented Object Notation)"""
+    if isinstance(obj, dict):
+        return "\n".join(
+            line for key, value in obj.items() for line in _toon_field(_toon_key(key), value, 0)
+        )
+    if isinstance(obj, (list, tuple)):
+        return "\n".join(_toon_field("", obj, 0))
+    return _toon_scalar(obj)
+
+# Tool definitions and the resource listing never change, so build them once
+TOOL_LIST: List[types.Tool] = [types.Tool(**schema) for schema in TOOL_SCHEMAS]
+
+RESOURCE_LIST: List[types.Resource] = [
+    types.Resource(
+        uri=AnyUrl("agent://config"),
+        name="Agent Configuration",
+        description="Current agent configuration and status",
+        mimeType=serialized_mime_type()
+    ),
+    types.Resource(
+        uri=AnyUrl("agent://capabilities"),
+        name="Agent Capabilities",
+        description="Detailed information about agent capabilities",
+        mimeType="text/plain"
+    )
+]
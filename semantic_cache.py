@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Semantic Response Cache for the GitHub MCP Agent
+Replays previous agent transcripts for queries that are near-duplicates of
+ones already answered, skipping the LLM round-trip entirely.
+"""
+
+import json
+import re
+import sqlite3
+import string
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_DB_PATH = Path.home() / ".cache" / "agent-makr" / "semcache.sqlite"
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.92
+
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+_NUMBER_RE = re.compile(r"\d+")
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query, drop punctuation and collapse whitespace"""
+    return " ".join(query.lower().translate(_PUNCT_TABLE).split())
+
+class SemanticCache:
+    """Embedding-based cache of agent transcripts keyed on user queries"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, model_name: str = DEFAULT_MODEL,
+                 threshold: float = DEFAULT_THRESHOLD):
+        self.db_path = Path(db_path)
+        self.model_name = model_name
+        self.threshold = threshold
+        self.enabled = True
+        self._model = None
+        self._index = None
+        self._conn = None
+        self._queries: List[str] = []
+        self._transcripts: List[List[str]] = []
+
+    def _load(self) -> bool:
+        """Load the embedding model and rebuild the index from disk on first use"""
+        if self._model is not None or not self.enabled:
+            return self.enabled
+
+        try:
+            import faiss
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            print(f"⚠️ Semantic cache disabled: {e}")
+            self.enabled = False
+            return False
+
+        print(f"🧠 Loading embedding model: {self.model_name}")
+        try:
+            model = SentenceTransformer(self.model_name)
+            index = faiss.IndexFlatIP(model.get_sentence_embedding_dimension())
+
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "query TEXT PRIMARY KEY, embedding BLOB NOT NULL, transcript TEXT NOT NULL)"
+            )
+            rows = conn.execute("SELECT query, embedding, transcript FROM entries").fetchall()
+            if rows:
+                index.add(np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows]))
+        except Exception as e:
+            # e.g. the model can't be downloaded while offline; run without the cache
+            print(f"⚠️ Semantic cache disabled: {e}")
+            self.enabled = False
+            return False
+
+        self._model, self._index, self._conn = model, index, conn
+        self._queries = [row[0] for row in rows]
+        self._transcripts = [json.loads(row[2]) for row in rows]
+        return True
+
+    def _embed(self, normalized: str):
+        """Embed a normalized query as a unit-length float32 row vector"""
+        return self._model.encode([normalized], normalize_embeddings=True).astype("float32")
+
+    def lookup(self, query: str) -> Optional[List[str]]:
+        """Return the cached transcript for a near-duplicate query, if any"""
+        if not self._load() or not self._queries:
+            return None
+
+        normalized = normalize_query(query)
+        numbers = _NUMBER_RE.findall(normalized)
+        scores, ids = self._index.search(self._embed(normalized), min(4, len(self._queries)))
+        for score, idx in zip(scores[0], ids[0]):
+            if idx < 0 or score < self.threshold:
+                break
+            # Similar wording with different operands is not the same question
+            if _NUMBER_RE.findall(self._queries[idx]) == numbers:
+                return self._transcripts[idx]
+        return None
+
+    def store(self, query: str, transcript: List[str]):
+        """Remember the transcript produced for a query"""
+        if not transcript or not self._load():
+            return
+
+        normalized = normalize_query(query)
+        if normalized in self._queries:
+            return
+        vector = self._embed(normalized)
+        self._index.add(vector)
+        self._queries.append(normalized)
+        self._transcripts.append(transcript)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (query, embedding, transcript) VALUES (?, ?, ?)",
+                (normalized, vector[0].tobytes(), json.dumps(transcript))
+            )
+
+    def close(self):
+        """Close the on-disk store"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
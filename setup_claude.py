@@ -4,42 +4,170 @@ Claude Desktop Setup Script for GitHub MCP Agent
 This script helps configure Claude Desktop to use our MCP server.
 """
 
+import functools
+import importlib
+import importlib.util
 import json
 import os
 import shutil
+import stat
 from pathlib import Path
 import sys
 
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        """Serialize the config to indented JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        """Serialize the config to indented JSON bytes"""
+        # Match orjson's output byte for byte: indent 2, raw UTF-8 rather than \u escapes
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(name):
+    """Find an executable on PATH, remembering the answer for this process"""
+    extensions = [""]
+    if sys.platform == "win32":
+        extensions += os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").lower().split(os.pathsep)
+
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not directory:
+            continue
+        for ext in extensions:
+            candidate = os.path.join(directory, name + ext)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+    return None
+
+# Results of stat() calls made during setup, keyed by path (None = missing)
+_stat_cache = {}
+
+def _safe_stat(path):
+    """stat() a path, returning None if it doesn't exist"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def _exists(path):
+    """Cached equivalent of Path.exists()"""
+    path = Path(path)
+    if path not in _stat_cache:
+        _stat_cache[path] = _safe_stat(path)
+    return _stat_cache[path] is not None
+
+# Directory containing this script (symlinks resolved), independent of the CWD
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Home directory, looked up once (Path.home() re-reads it on every call)
+_HOME = os.path.expanduser("~")
+
+# Location of the Claude Desktop config relative to the home directory
+_CONFIG_SUBPATH = {
+    "darwin": ("Library", "Application Support", "Claude", "claude_desktop_config.json"),  # macOS
+    "win32": ("AppData", "Roaming", "Claude", "claude_desktop_config.json"),  # Windows
+}.get(sys.platform, (".config", "claude", "claude_desktop_config.json"))  # Linux
+
+def _compute_config_path():
+    """Compute the Claude Desktop configuration file path based on OS"""
+    return Path(os.path.join(_HOME, *_CONFIG_SUBPATH))
+
+# The platform and home directory can't change while we run
+_CLAUDE_CONFIG_PATH = _compute_config_path()
+
 def get_claude_config_path():
     """Get the Claude Desktop configuration file path based on OS"""
-    home = Path.home()
+    return _CLAUDE_CONFIG_PATH
+
+# ioctl request number for Linux FICLONE (reflink copy on btrfs/XFS)
+_FICLONE = 0x40049409
+
+def _clone_file(src, dst):
+    """Copy src to dst, avoiding a data copy where the filesystem allows it"""
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    # os.link doesn't follow symlinks on Linux, so a symlinked config would be
+    # "backed up" as a second link to the live file; copy its contents instead
+    if os.path.islink(src):
+        shutil.copy2(src, dst)
+        return
 
-    if sys.platform == "darwin":  # macOS
-        return home / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json"
-    elif sys.platform == "win32":  # Windows
-        return home / "AppData" / "Roaming" / "Claude" / "claude_desktop_config.json"
-    else:  # Linux
-        return home / ".config" / "claude" / "claude_desktop_config.json"
+    # A hard link is enough because the config is only ever replaced with
+    # os.replace, which leaves the linked (old) inode untouched
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+            with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+                fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
 
 def backup_existing_config(config_path):
-    """Backup existing Claude Desktop configuration"""
-    if config_path.exists():
-        backup_path = config_path.with_suffix('.json.backup')
-        shutil.copy2(config_path, backup_path)
-        print(f"✅ Backed up existing config to: {backup_path}")
-        return True
-    return False
+    """Backup existing Claude Desktop configuration (the file must exist)"""
+    backup_path = config_path.with_suffix('.json.backup')
+    _clone_file(config_path, backup_path)
+    print(f"✅ Backed up existing config to: {backup_path}")
+    return True
 
 def load_existing_config(config_path):
-    """Load existing Claude Desktop configuration"""
-    if config_path.exists():
+    """Load existing Claude Desktop configuration, or None if there is no file"""
+    # Just try the open; a separate exists() check would cost another stat
+    try:
+        fd = os.open(config_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+
+    # One read() of the whole file straight into the parser
+    try:
+        data = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+    try:
+        return _loads(data)
+    except json.JSONDecodeError:
+        print("⚠️ Existing config file has invalid JSON, creating new one")
+        return {}
+
+def write_config_atomic(config_path, data):
+    """Write the configuration in one write() and atomically swap it into place"""
+    # Swap the file a symlinked config points at (e.g. in a dotfiles repo), not the link
+    target = Path(os.path.realpath(config_path))
+    tmp_path = target.with_suffix('.json.tmp')
+    try:
+        with open(tmp_path, 'wb', buffering=0) as f:
+            # Keep the existing file's permissions; it may hold other servers' secrets
+            try:
+                os.fchmod(f.fileno(), stat.S_IMODE(os.stat(target).st_mode))
+            except FileNotFoundError:
+                pass
+            f.write(data)
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+    except BaseException:
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            print("⚠️ Existing config file has invalid JSON, creating new one")
-            return {}
-    return {}
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
 
 def setup_claude_desktop():
     """Main setup function"""
@@ -47,128 +175,121 @@ def setup_claude_desktop():
     print("=" * 50)
 
     # Get paths
-    project_root = Path(__file__).parent.absolute()
-    mcp_server_path = project_root / "mcp_server.py"
+    mcp_server_path = PROJECT_ROOT / "mcp_server.py"
     config_path = get_claude_config_path()
 
-    print(f"📁 Project root: {project_root}")
+    print(f"📁 Project root: {PROJECT_ROOT}")
     print(f"🔧 MCP server: {mcp_server_path}")
     print(f"⚙️ Claude config: {config_path}")
 
     # Verify MCP server exists
-    if not mcp_server_path.exists():
+    if not _exists(mcp_server_path):
         print(f"❌ Error: MCP server file not found at {mcp_server_path}")
         return False
 
     # Find UV path
-    uv_path = shutil.which("uv")
+    uv_path = _which_cached("uv")
     if not uv_path:
         # Try common locations
         common_uv_paths = [
-            Path.home() / ".local" / "bin" / "uv",
+            Path(_HOME, ".local", "bin", "uv"),
             Path("/usr/local/bin/uv"),
             Path("/opt/homebrew/bin/uv")
         ]
-        for path in common_uv_paths:
-            if path.exists():
-                uv_path = str(path)
-                break
+        found = next((path for path in common_uv_paths if _exists(path)), None)
+        if found:
+            uv_path = str(found)
 
     # Find Python path in the virtual environment
-    venv_python = project_root / ".venv" / "bin" / "python"
+    venv_python = PROJECT_ROOT / ".venv" / "bin" / "python"
 
     print(f"🔍 UV path: {uv_path}")
     print(f"🐍 Python venv: {venv_python}")
 
-    # Create config directory if it doesn't exist
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Backup existing config
-    backup_existing_config(config_path)
-
-    # Load existing config
+    # Load existing config; only a fresh install needs the directory created
     config = load_existing_config(config_path)
+    config_exists = config is not None
+    if not config_exists:
+        os.makedirs(config_path.parent, exist_ok=True)
+        config = {}
 
     # Ensure mcpServers section exists
     if "mcpServers" not in config:
         config["mcpServers"] = {}
+    prev_entry = config["mcpServers"].get("github-mcp-agent")
 
     # Choose the best configuration method - use bash wrapper for maximum compatibility
-    wrapper_script_path = project_root / "run_mcp_server.sh"
-    standalone_server_path = project_root / "mcp_server_standalone.py"
-
-    if wrapper_script_path.exists():
-        print("✅ Using bash wrapper script (handles spaces in paths)")
-        # Use the bash wrapper script that handles all the complexity
-        config["mcpServers"]["github-mcp-agent"] = {
-            "command": str(wrapper_script_path),
-            "args": []
-        }
-    elif standalone_server_path.exists():
-        print("✅ Using standalone MCP server")
-        # Use the standalone server that handles its own dependencies
-        config["mcpServers"]["github-mcp-agent"] = {
-            "command": str(venv_python) if venv_python.exists() else (shutil.which("python3") or shutil.which("python")),
-            "args": [
-                str(standalone_server_path)
-            ],
-            "env": {
-                "PYTHONPATH": f'"{project_root}"'  # Quote the path to handle spaces
-            }
+    wrapper_script_path = PROJECT_ROOT / "run_mcp_server.sh"
+    standalone_server_path = PROJECT_ROOT / "mcp_server_standalone.py"
+
+    pythonpath_env = {"PYTHONPATH": f'"{PROJECT_ROOT}"'}  # Quote the path to handle spaces
+
+    def system_python():
+        return _which_cached("python3") or _which_cached("python")
+
+    # Bash wrapper script that handles all the complexity
+    def wrapper_config():
+        return {"command": str(wrapper_script_path), "args": []}
+
+    # Standalone server that handles its own dependencies
+    def standalone_config():
+        return {
+            "command": str(venv_python) if _exists(venv_python) else system_python(),
+            "args": [str(standalone_server_path)],
+            "env": pythonpath_env
         }
-    elif uv_path and Path(uv_path).exists():
-        print("✅ Using UV with full path")
-        # Add our MCP server configuration with full UV path
-        config["mcpServers"]["github-mcp-agent"] = {
+
+    def uv_config():
+        return {
             "command": uv_path,
-            "args": [
-                "run",
-                "--directory", f'"{project_root}"',  # Quote directory path
-                "python",
-                str(mcp_server_path)
-            ],
-            "env": {
-                "PYTHONPATH": f'"{project_root}"'  # Quote the path to handle spaces
-            }
-        }
-    elif venv_python.exists():
-        print("✅ Using virtual environment Python directly")
-        # Use the virtual environment Python directly
-        config["mcpServers"]["github-mcp-agent"] = {
-            "command": str(venv_python),
-            "args": [
-                str(mcp_server_path)
-            ],
-            "env": {
-                "PYTHONPATH": f'"{project_root}"'  # Quote the path to handle spaces
-            }
-        }
-    else:
-        print("⚠️ Using system Python (less reliable)")
-        # Fallback to system Python
-        python_path = shutil.which("python3") or shutil.which("python")
-        config["mcpServers"]["github-mcp-agent"] = {
-            "command": python_path,
-            "args": [
-                str(mcp_server_path)
-            ],
-            "env": {
-                "PYTHONPATH": f'"{project_root}"'  # Quote the path to handle spaces
-            }
+            "args": ["run", "--directory", f'"{PROJECT_ROOT}"', "python", str(mcp_server_path)],
+            "env": pythonpath_env
         }
 
+    def venv_config():
+        return {"command": str(venv_python), "args": [str(mcp_server_path)], "env": pythonpath_env}
+
+    def system_config():
+        return {"command": system_python(), "args": [str(mcp_server_path)], "env": pythonpath_env}
+
+    # Launch methods, best first: (message, whether it can be used here, path
+    # that must also exist or None, config builder). Paths are only checked
+    # until a method is picked.
+    candidates = [
+        ("✅ Using bash wrapper script (handles spaces in paths)", True, wrapper_script_path, wrapper_config),
+        ("✅ Using standalone MCP server", True, standalone_server_path, standalone_config),
+        ("✅ Using UV with full path", bool(uv_path), uv_path, uv_config),
+        ("✅ Using virtual environment Python directly", True, venv_python, venv_config),
+        ("⚠️ Using system Python (less reliable)", True, None, system_config),
+    ]
+
+    for message, enabled, required_path, build in candidates:
+        if enabled and (required_path is None or _exists(required_path)):
+            print(message)
+            config["mcpServers"]["github-mcp-agent"] = build()
+            break
+
+    # Nothing to do if the file already has exactly this entry
+    if config["mcpServers"]["github-mcp-agent"] == prev_entry:
+        print("✅ Config already up to date")
+        return True
+
+    # Backup existing config
+    if config_exists:
+        backup_existing_config(config_path)
+
     # Write the updated configuration
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-        print(f"✅ Successfully updated Claude Desktop configuration!")
-        print(f"📝 Configuration saved to: {config_path}")
-
-        print("\n🎯 Next Steps:")
-        print("1. 🔄 Restart Claude Desktop application")
-        print("2. 🔌 The GitHub MCP Agent should now be available in Claude")
-        print("3. 🧪 Test with commands like: 'Add 15 and 27' or 'Get system info'")
-        print("4. 🛠️ Use tools: add_numbers, multiply_numbers, get_agent_help")
+        write_config_atomic(config_path, _dumps(config))
+        sys.stdout.write("\n".join([
+            "✅ Successfully updated Claude Desktop configuration!",
+            f"📝 Configuration saved to: {config_path}",
+            "\n🎯 Next Steps:",
+            "1. 🔄 Restart Claude Desktop application",
+            "2. 🔌 The GitHub MCP Agent should now be available in Claude",
+            "3. 🧪 Test with commands like: 'Add 15 and 27' or 'Get system info'",
+            "4. 🛠️ Use tools: add_numbers, multiply_numbers, get_agent_help"
+        ]) + "\n")
 
         return True
 
@@ -181,21 +302,18 @@ def test_mcp_server():
     print("\n🧪 Testing MCP Server Configuration...")
     print("=" * 50)
 
-    project_root = Path(__file__).parent.absolute()
-
     # Test if we can import required modules
-    sys.path.insert(0, str(project_root))
+    sys.path.insert(0, str(PROJECT_ROOT))
 
-    try:
-        import mcp
-        print("✅ MCP library available")
-    except ImportError:
+    # Only look the package up; the MCP server imports it for real
+    if importlib.util.find_spec("mcp") is None:
         print("❌ MCP library not found - ensure dependencies are installed")
         return False
+    print("✅ MCP library available")
 
     try:
-        from agent_demo import load_llm_config
-        config = load_llm_config()
+        agent_demo = importlib.import_module("agent_demo")
+        config = agent_demo.load_llm_config()
         print(f"✅ Agent configuration loaded: {config.provider}")
     except Exception as e:
         print(f"❌ Error loading agent config: {e}")
@@ -206,8 +324,7 @@ def test_mcp_server():
 
 def show_usage_examples():
     """Show example commands for Claude Desktop"""
-    print("\n📚 Usage Examples for Claude Desktop:")
-    print("=" * 50)
+    out = ["\n📚 Usage Examples for Claude Desktop:", "=" * 50]
 
     examples = [
         {
@@ -237,9 +354,11 @@ def show_usage_examples():
     ]
 
     for example in examples:
-        print(f"\n🔹 {example['description']}:")
+        out.append(f"\n🔹 {example['description']}:")
         for cmd in example['commands']:
-            print(f"   💬 \"{cmd}\"")
+            out.append(f"   💬 \"{cmd}\"")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 def main():
     """Main function"""
@@ -257,11 +376,13 @@ def main():
     if success:
         show_usage_examples()
 
-        print(f"\n🔍 Troubleshooting:")
-        print("- If Claude Desktop doesn't see the agent, check the logs")
-        print("- Ensure UV and Python are in your PATH")
-        print("- Run with --test flag to verify configuration")
-        print("- Check that dependencies are installed: uv sync")
+        sys.stdout.write("\n".join([
+            "\n🔍 Troubleshooting:",
+            "- If Claude Desktop doesn't see the agent, check the logs",
+            "- Ensure UV and Python are in your PATH",
+            "- Run with --test flag to verify configuration",
+            "- Check that dependencies are installed: uv sync"
+        ]) + "\n")
 
     print(f"\n📖 For more information, see the README.md file")
 
@@ -4,53 +4,46 @@ Test script for the GitHub MCP Agent
 This script verifies that all dependencies are correctly installed and working.
 """
 
+import importlib.metadata
+import importlib.util
 import sys
 import os
 from pathlib import Path
 
 # Add project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# (label, module, distribution to report the version of) for each dependency
+_IMPORT_PROBES = [
+    ("langchain", "langchain", "langchain"),
+    ("langgraph", "langgraph", None),
+    ("langchain_ollama", "langchain_ollama", None),
+    ("langchain_google_genai", "langchain_google_genai", None),
+    ("python-dotenv", "dotenv", None),
+    ("pydantic", "pydantic", "pydantic"),
+]
 
 def test_imports():
-    """Test that all required packages can be imported"""
-    print("🧪 Testing package imports...")
-
-    try:
-        import langchain
-        print(f"✅ langchain v{langchain.__version__}")
-    except ImportError as e:
-        print(f"❌ langchain: {e}")
-
-    try:
-        import langgraph
-        print(f"✅ langgraph imported successfully")
-    except ImportError as e:
-        print(f"❌ langgraph: {e}")
-
-    try:
-        from langchain_ollama import ChatOllama
-        print("✅ langchain_ollama imported successfully")
-    except ImportError as e:
-        print(f"❌ langchain_ollama: {e}")
-
-    try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        print("✅ langchain_google_genai imported successfully")
-    except ImportError as e:
-        print(f"❌ langchain_google_genai: {e}")
-
-    try:
-        from dotenv import load_dotenv
-        print("✅ python-dotenv imported successfully")
-    except ImportError as e:
-        print(f"❌ python-dotenv: {e}")
-
-    try:
-        import pydantic
-        print(f"✅ pydantic v{pydantic.__version__}")
-    except ImportError as e:
-        print(f"❌ pydantic: {e}")
+    """Check that all required packages are installed (without importing them)"""
+    out = ["🧪 Checking installed packages..."]
+
+    # Locate each package without executing it; versions come from the
+    # installed metadata rather than a full import
+    for label, module_name, dist_name in _IMPORT_PROBES:
+        if importlib.util.find_spec(module_name) is None:
+            out.append(f"❌ {label}: No module named '{module_name}'")
+            continue
+        try:
+            version = importlib.metadata.version(dist_name) if dist_name else None
+        except importlib.metadata.PackageNotFoundError:
+            version = None
+        if version:
+            out.append(f"✅ {label} v{version}")
+        else:
+            out.append(f"✅ {label} installed")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 def test_basic_functionality():
     """Test basic agent functionality"""
@@ -66,6 +59,41 @@ def test_basic_functionality():
     result = test_add.invoke({"a": 5, "b": 3})
     print(f"✅ Tool execution test: 5 + 3 = {result}")
 
+def test_semantic_cache():
+    """Test that a query answered in one run is replayed from the cache in the next"""
+    print("\n🧠 Testing semantic cache replay...")
+
+    import tempfile
+    from agent_demo import _refers_to_context
+    from semantic_cache import SemanticCache
+
+    query = "Add 15 and 27"
+    transcript = ["🤖 Assistant: I'll add 15 and 27 for you.", "🔧 Tool: 42"]
+
+    # Only self-contained queries go through the cache
+    assert not _refers_to_context(query)
+    assert _refers_to_context("Multiply that by 2")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "semcache.sqlite"
+
+        first_run = SemanticCache(db_path=db_path)
+        first_run.store(query, transcript)
+        first_run.close()
+        if not first_run.enabled:
+            print("⏭️ Skipped: semantic cache dependencies or model unavailable")
+            return
+
+        # A fresh instance on the same database stands in for the next run
+        second_run = SemanticCache(db_path=db_path)
+        try:
+            assert second_run.lookup("add 15 and 27!") == transcript
+            assert second_run.lookup("Add 15 and 28") is None
+        finally:
+            second_run.close()
+
+    print("✅ Semantic cache replayed the previous run's answer")
+
 def main():
     """Run all tests"""
     print("🚀 GitHub MCP Agent - Dependency Test")
@@ -73,9 +101,12 @@ def main():
 
     test_imports()
     test_basic_functionality()
+    test_semantic_cache()
 
     print("\n" + "=" * 50)
-    print("🎉 Test completed! Your environment is ready.")
+    # test_imports only locates packages; a broken install can still fail on import
+    print("🎉 Test completed! Required packages are installed.")
+    print("💡 Run agent_demo.py to confirm they import and run correctly.")
     print("\n📝 Next steps:")
     print("1. Set up your .env file with API keys")
     print("2. Run the Jupyter notebook: agent_notebook.ipynb")